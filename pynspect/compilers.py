@@ -33,6 +33,8 @@ __credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
 
 import re
 import datetime
+import functools
+import collections.abc
 
 
 import ipranges
@@ -40,7 +42,8 @@ from pynspect.rules import Rule, IPV4Rule, IPV6Rule, DatetimeRule, TimedeltaRule
     IntegerRule, FloatRule, NumberRule, VariableRule, LogicalBinOpRule,\
     UnaryOperationRule, ComparisonBinOpRule, MathBinOpRule, ConstantRule,\
     ListRule, FunctionRule
-from pynspect.traversers import ListIP, BaseFilteringTreeTraverser
+from pynspect.traversers import SortedIPList, BaseFilteringTreeTraverser
+from pynspect.jpath import jpath_parse_c
 
 
 TIMESTAMP_RE = re.compile(r"^([0-9]{4})-([0-9]{2})-([0-9]{2})[Tt]([0-9]{2}):([0-9]{2}):([0-9]{2})(?:\.([0-9]+))?([Zz]|(?:[+-][0-9]{2}:[0-9]{2}))$")
@@ -48,6 +51,26 @@ TIMESTAMP_RE = re.compile(r"^([0-9]{4})-([0-9]{2})-([0-9]{2})[Tt]([0-9]{2}):([0-
 DURATION_RE = re.compile(r"^((?P<days>[0-9]+)[D|d])?(?P<hrs>[0-9]{2}):(?P<mins>[0-9]{2}):(?P<secs>[0-9]{2})$")
 
 
+@functools.lru_cache(maxsize = 4096)
+def _compile_ip_v4(value):
+    """
+    Internal helper method: compile given IPv4 literal into :py:class:`pynspect.rules.IPV4Rule`
+    object. Results are memoized, because the same address literals tend to be
+    compiled repeatedly when rule trees are reused or recompiled and the compiled
+    rules are read-only, so sharing them is safe.
+    """
+    return IPV4Rule(ipranges.from_str_v4(value))
+
+@functools.lru_cache(maxsize = 4096)
+def _compile_ip_v6(value):
+    """
+    Internal helper method: compile given IPv6 literal into :py:class:`pynspect.rules.IPV6Rule`
+    object. Results are memoized, because the same address literals tend to be
+    compiled repeatedly when rule trees are reused or recompiled and the compiled
+    rules are read-only, so sharing them is safe.
+    """
+    return IPV6Rule(ipranges.from_str_v6(value))
+
 def compile_ip_v4(rule):
     """
     Compiler helper method: attempt to compile constant into object representing
@@ -56,7 +79,7 @@ def compile_ip_v4(rule):
     """
     if isinstance(rule.value, ipranges.Range):
         return rule
-    return IPV4Rule(ipranges.from_str_v4(rule.value))
+    return _compile_ip_v4(rule.value)
 
 def compile_ip_v6(rule):
     """
@@ -66,32 +89,57 @@ def compile_ip_v6(rule):
     """
     if isinstance(rule.value, ipranges.Range):
         return rule
-    return IPV6Rule(ipranges.from_str_v6(rule.value))
+    return _compile_ip_v6(rule.value)
 
-def compile_datetime(rule):
+@functools.lru_cache(maxsize = 4096)
+def _parse_datetime(value):
     """
-    Compiler helper method: attempt to compile constant into object representing
-    datetime object to enable relations and thus simple comparisons using Python
-    operators.
+    Internal helper method: parse given value into :py:class:`datetime.datetime`
+    object. Results are memoized, because the same timestamp literals tend to be
+    compiled repeatedly when rule trees are reused or recompiled.
     """
-    if isinstance(rule.value, datetime.datetime):
-        return rule
     try:
         # Try numeric type
-        return DatetimeRule(datetime.datetime.fromtimestamp(float(rule.value)))
+        return datetime.datetime.fromtimestamp(float(value))
     except (TypeError, ValueError):
         pass
+    # Try ISO 8601/RFC3339 timestamp string. The fromisoformat() parser is
+    # implemented in C and is much faster than the regular expression below,
+    # which is kept only as a fallback for more exotic formats.
+    try:
+        result = datetime.datetime.fromisoformat(str(value).replace('z', '+00:00').replace('Z', '+00:00'))
+        if result.tzinfo is not None:
+            zonediff = result.utcoffset()
+            result = result.replace(tzinfo = None) - zonediff
+        return result
+    except ValueError:
+        pass
     # Try RFC3339 timestamp string
-    res = TIMESTAMP_RE.match(str(rule.value))
+    res = TIMESTAMP_RE.match(str(value))
     if res is not None:
         year, month, day, hour, minute, second = (int(n or 0) for n in res.group(*range(1, 7)))
         us_str = (res.group(7) or "0")[:6].ljust(6, "0")
         us_int = int(us_str)
+        result = datetime.datetime(year, month, day, hour, minute, second, us_int)
         zonestr = res.group(8)
-        zonespl = (0, 0) if zonestr in ['z', 'Z'] else [int(i) for i in zonestr.split(":")]
-        zonediff = datetime.timedelta(minutes = zonespl[0]*60+zonespl[1])
-        return DatetimeRule(datetime.datetime(year, month, day, hour, minute, second, us_int) - zonediff)
-    raise ValueError("Wrong datetime format '{}'".format(rule.value))
+        # Fast path the common UTC case, the timedelta arithmetic is necessary
+        # only for nonzero timezone offsets.
+        if zonestr in ('z', 'Z'):
+            return result
+        zonesign = -1 if zonestr[0] == '-' else 1
+        zonediff = datetime.timedelta(minutes = zonesign * (int(zonestr[1:3]) * 60 + int(zonestr[4:6])))
+        return result - zonediff
+    raise ValueError("Wrong datetime format '{}'".format(value))
+
+def compile_datetime(rule):
+    """
+    Compiler helper method: attempt to compile constant into object representing
+    datetime object to enable relations and thus simple comparisons using Python
+    operators.
+    """
+    if isinstance(rule.value, datetime.datetime):
+        return rule
+    return DatetimeRule(_parse_datetime(rule.value))
 
 def compile_timedelta(rule):
     """
@@ -135,7 +183,25 @@ def compile_timeoper(rule):
     raise ValueError("Wrong time operation constant '{}'".format(rule))
 
 
+# Interned flyweight rules for small integer literals. Constant folding of
+# math operations tends to produce the same small numbers (thresholds, port
+# numbers) over and over again and rule objects are immutable once compiled,
+# so the instances can be safely shared instead of allocated anew.
+_SMALL_INT_RULES = {i: IntegerRule(i) for i in range(-256, 1024)}
+
+def _int_rule(value):
+    """
+    Internal helper method: provide :py:class:`pynspect.rules.IntegerRule` object
+    for given integer value, reusing the shared interned instance for small values.
+    """
+    rule = _SMALL_INT_RULES.get(value)
+    if rule is None:
+        return IntegerRule(value)
+    return rule
+
+
 CVRE = re.compile(r'\[\d+\]')
+@functools.lru_cache(maxsize = 1024)
 def clean_variable(var):
     """
     Remove any array indices from variable name to enable indexing into :py:data:`COMPILATIONS_IDEA_OBJECT_CMP`
@@ -143,7 +209,15 @@ def clean_variable(var):
 
     This dictionary contains postprocessing callback appropriate for opposing
     operand of comparison operation for variable on given JPath.
+
+    Results are memoized, because filtering rules tend to reference the same
+    small set of variables over and over again and the regex substitution would
+    otherwise be performed on every comparison rule compilation. Typical
+    variable names (``Source.IP4``, ``DetectTime``, ...) contain no index at
+    all, so the regex engine is invoked only when a ``[`` is actually present.
     """
+    if '[' not in var:
+        return var
     return CVRE.sub('', var)
 
 
@@ -160,10 +234,47 @@ class IPListRule(ListRule):
         self.value = rules
 
     def values(self):
-        return ListIP([i.value for i in self.value])
+        """
+        Return true values of the rules in the list. The result is kept sorted
+        for fast binary searched membership tests and cached, because the
+        filtering process requests it for every processed message.
+        """
+        values = getattr(self, '_values', None)
+        if values is None:
+            values = SortedIPList([i.value for i in self.value])
+            self._values = values
+        return values
 
     def __repr__(self):
-        return "IPLIST({})".format(', '.join([repr(v) for v in self.value]))
+        # Cache the result just like values(): rules are immutable once
+        # compiled and loggers may stringify the same rule for every processed
+        # message, so the join over all list items is performed only once.
+        result = getattr(self, '_repr', None)
+        if result is None:
+            result = "IPLIST({})".format(', '.join([repr(v) for v in self.value]))
+            self._repr = result
+        return result
+
+
+class FrozenSetRule(ListRule):
+    """
+    Custom rule for lists of hashable scalar constants, that are compiled into
+    a :py:class:`frozenset` to provide constant time membership tests for the
+    ``OP_IN`` comparison operation instead of linear scans.
+    """
+
+    def values(self):
+        """
+        Return true values of the rules in the list as a frozenset.
+        """
+        values = getattr(self, '_values', None)
+        if values is None:
+            values = frozenset(i.value for i in self.value)
+            self._values = values
+        return values
+
+    def __repr__(self):
+        return "FROZENSET({})".format(', '.join([repr(v) for v in self.value]))
 
 
 class ConversionRule(Rule):
@@ -183,18 +294,18 @@ class ConversionRule(Rule):
     def __repr__(self):
         return "CONVERSION({}:{})".format(repr(self.rule), self.conversion.__name__)
 
-    def traverse(self, traverser, **kwargs):
+    def traverse(self, traverser, obj = None):
         """
         Implementation of mandatory interface for traversing the whole rule tree.
         This method will call the ``traverse`` method of child rule tree and
         then perform arbitrary conversion of the result before returning it back.
-        The optional ``kwargs`` are passed down to traverser callback as additional
-        arguments and can be used to provide additional data or context.
+        The optional ``obj`` argument is passed down to traverser callback and
+        can be used to provide the processed data structure or other context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
-        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        :param obj: Additional optional data structure to be passed down to traverser callback.
         """
-        result = self.rule.traverse(traverser, **kwargs)
+        result = self.rule.traverse(traverser, obj)
         return self.conversion(result)
 
 
@@ -280,14 +391,22 @@ class IDEAFilterCompiler(BaseFilteringTreeTraverser):
         """
         compilation = compilation_list.get(key, None)
         if compilation:
+            callback = compilation['callback']
             if isinstance(val, ListRule):
-                result = []
-                for itemv in val.value:
-                    result.append(compilation['callback'](itemv))
-
-                val = compilation['listclass'](result)
+                result = [callback(itemv) for itemv in val.value]
+
+                listclass = compilation['listclass']
+                # Plain lists of hashable scalar constants may be compiled
+                # into a frozenset for constant time membership tests. This is
+                # valid only for the 'OP_IN' operation: operations comparing
+                # the whole list (like 'OP_IS') depend on the item order,
+                # which a set would not preserve.
+                if listclass is ListRule and rule.operation == 'OP_IN' \
+                        and all(isinstance(itemr.value, collections.abc.Hashable) for itemr in result):
+                    listclass = FrozenSetRule
+                val = listclass(result)
             else:
-                val = compilation['callback'](val)
+                val = callback(val)
         return result_class(rule.operation, var, val)
 
     def _compile_operation_rule(self, rule, left, right, result_class):
@@ -351,8 +470,8 @@ class IDEAFilterCompiler(BaseFilteringTreeTraverser):
         if isinstance(left, IntegerRule) and isinstance(right, IntegerRule):
             result = self.evaluate_binop_math(rule.operation, left.value, right.value)
             if isinstance(result, list):
-                return ListRule([IntegerRule(r) for r in result])
-            return IntegerRule(result)
+                return ListRule([_int_rule(r) for r in result])
+            return _int_rule(result)
 
         # Otherwise the result is float.
         if isinstance(left, NumberRule) and isinstance(right, NumberRule):
@@ -368,76 +487,94 @@ class IDEAFilterCompiler(BaseFilteringTreeTraverser):
     #---------------------------------------------------------------------------
 
 
-    def ipv4(self, rule, **kwargs):
+    def ipv4(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.ipv4` interface.
         """
-        rule = compile_ip_v4(rule)
-        return rule
+        return compile_ip_v4(rule)
 
-    def ipv6(self, rule, **kwargs):
+    def ipv6(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.ipv6` interface.
         """
-        rule = compile_ip_v4(rule)
-        return rule
+        return compile_ip_v6(rule)
 
-    def datetime(self, rule, **kwargs):
+    def datetime(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.datetime` interface.
         """
-        rule = compile_datetime(rule)
-        return rule
+        return compile_datetime(rule)
 
-    def timedelta(self, rule, **kwargs):
+    def timedelta(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.timedelta` interface.
         """
-        rule = compile_timedelta(rule)
-        return rule
+        return compile_timedelta(rule)
 
-    def integer(self, rule, **kwargs):
+    def integer(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.integer` interface.
         """
         rule.value = int(rule.value)
         return rule
 
-    def float(self, rule, **kwargs):
+    def float(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.float` interface.
         """
         rule.value = float(rule.value)
         return rule
 
-    def constant(self, rule, **kwargs):
+    def constant(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.constant` interface.
         """
         return rule
 
-    def variable(self, rule, **kwargs):
+    def variable(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.variable` interface.
         """
+        # Pre-parse the JPath once during compilation, so the filtering does
+        # not have to parse (or look up) the path string for every processed
+        # message. The parsed chunks come from the internal parser cache and
+        # must be treated as read only.
+        rule.parsed_path = jpath_parse_c(rule.value)
         return rule
 
-    def list(self, rule, **kwargs):
+    def list(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.list` interface.
         """
         return rule
 
-    def binary_operation_logical(self, rule, left, right, **kwargs):
+    def binary_operation_logical(self, rule, left, right, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_logical` interface.
-        """
+
+        Because the rule tree is traversed bottom-up, constant operands are
+        already folded at this point and the operation may be partially or
+        completely evaluated at compile time, shrinking the rule tree for all
+        subsequent filtering runs.
+        """
+        if isinstance(left, ConstantRule):
+            if isinstance(right, ConstantRule):
+                return ConstantRule(self.evaluate_binop_logical(rule.operation, left.value, right.value))
+            if rule.operation in ('OP_AND', 'OP_AND_P'):
+                return right if left.value else left
+            if rule.operation in ('OP_OR', 'OP_OR_P'):
+                return left if left.value else right
         return LogicalBinOpRule(rule.operation, left, right)
 
-    def binary_operation_comparison(self, rule, left, right, **kwargs):
+    def binary_operation_comparison(self, rule, left, right, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_comparison` interface.
+
+        Comparisons with constants on both sides are evaluated already at
+        compile time and replaced with a single constant rule.
         """
+        if isinstance(left, ConstantRule) and isinstance(right, ConstantRule):
+            return ConstantRule(self.evaluate_binop_comparison(rule.operation, left.value, right.value))
         return self._compile_operation_rule(
             rule,
             left,
@@ -445,7 +582,7 @@ class IDEAFilterCompiler(BaseFilteringTreeTraverser):
             ComparisonBinOpRule
         )
 
-    def binary_operation_math(self, rule, left, right, **kwargs):
+    def binary_operation_math(self, rule, left, right, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_math` interface.
         """
@@ -458,13 +595,18 @@ class IDEAFilterCompiler(BaseFilteringTreeTraverser):
             MathBinOpRule
         )
 
-    def unary_operation(self, rule, right, **kwargs):
+    def unary_operation(self, rule, right, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.unary_operation` interface.
+
+        Negation of a constant operand is evaluated already at compile time and
+        replaced with a single constant rule.
         """
+        if rule.operation == 'OP_NOT' and isinstance(right, ConstantRule):
+            return ConstantRule(self.evaluate_unop(rule.operation, right.value))
         return UnaryOperationRule(rule.operation, right)
 
-    def function(self, rule, args, **kwargs):
+    def function(self, rule, args, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.function` interface.
         """
@@ -98,9 +98,12 @@ __credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>"
 import time
 import datetime
 
-from pynspect.rules import FilteringRuleException
+from pynspect.rules import FilteringRuleException, ValueRule, VariableRule,\
+    ConstantRule, IPV4Rule, IPV6Rule, DatetimeRule, TimedeltaRule, IntegerRule,\
+    FloatRule, ListRule, LogicalBinOpRule, ComparisonBinOpRule, MathBinOpRule,\
+    UnaryOperationRule, FunctionRule
 from pynspect.traversers import BaseFilteringTreeTraverser
-from pynspect.jpath import jpath_values
+from pynspect.jpath import jpath_values, jpath_values_parsed, jpath_parse_c
 
 
 #-------------------------------------------------------------------------------
@@ -228,87 +231,443 @@ class DataObjectFilter(BaseFilteringTreeTraverser):
         :return: True or False or expression result
         :rtype: bool or any
         """
-        return rule.traverse(self, obj = data)
+        # The JPath evaluation cache is valid only for single data structure,
+        # so it is kept as a local of this single filtering run and passed
+        # down to the expansion handlers. Keeping it off the instance makes
+        # recursive filter() calls from registered function callbacks and
+        # concurrent use of one filter object safe.
+        jpath_cache = {}
+
+        # Evaluate the rule tree iteratively in post-order with an explicit
+        # stack instead of recursing through the Rule.traverse methods. This
+        # avoids the Python call frame setup for each tree node and removes
+        # the recursion depth limit for pathologically deep rule trees (very
+        # long and/or chains). Each stack entry carries a flag whether the
+        # children of the node were already expanded, evaluated subexpression
+        # results are collected on a separate value stack. Node handlers are
+        # dispatched by single dictionary lookup on the exact rule type, rule
+        # types missing from the dispatch tables (for example the
+        # pynspect.compilers.ConversionRule with custom traverse method) fall
+        # back to plain traversal.
+        stack     = [(rule, False)]
+        values    = []
+        expanders = self._FILTER_EXPANDERS
+        reducers  = self._FILTER_REDUCERS
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                reducers[type(node)](self, node, values)
+                continue
+            handler = expanders.get(type(node))
+            if handler is not None:
+                handler(self, node, data, stack, values, jpath_cache)
+            else:
+                values.append(node.traverse(self, data))
+        return values[0]
 
     #---------------------------------------------------------------------------
 
-    def ipv4(self, rule, **kwargs):
+    def _expand_binop(self, node, data, stack, values, cache):
+        """
+        Iterative evaluation handler: schedule evaluation of both binary
+        operation subtrees followed by reduction of the node itself.
+        """
+        stack.append((node, True))
+        stack.append((node.right, False))
+        stack.append((node.left, False))
+
+    def _expand_unop(self, node, data, stack, values, cache):
+        """
+        Iterative evaluation handler: schedule evaluation of the unary
+        operation subtree followed by reduction of the node itself.
+        """
+        stack.append((node, True))
+        stack.append((node.right, False))
+
+    def _expand_function(self, node, data, stack, values, cache):
+        """
+        Iterative evaluation handler: schedule evaluation of all function
+        arguments followed by reduction of the node itself.
+        """
+        stack.append((node, True))
+        for arg in reversed(node.args):
+            stack.append((arg, False))
+
+    def _expand_variable(self, node, data, stack, values, cache):
+        """
+        Iterative evaluation handler: evaluate variable leaf node, memoizing
+        the JPath evaluations in given per-call cache.
+        """
+        path = node.value
+        if path in cache:
+            values.append(cache[path])
+            return
+        result = self.variable(node, data)
+        cache[path] = result
+        values.append(result)
+
+    def _expand_list(self, node, data, stack, values, cache):
+        """
+        Iterative evaluation handler: evaluate list leaf node.
+        """
+        values.append(node.values())
+
+    def _expand_value(self, node, data, stack, values, cache):
+        """
+        Iterative evaluation handler: evaluate constant leaf node.
+        """
+        values.append(node.value)
+
+    def _reduce_logical(self, node, values):
+        """
+        Iterative evaluation handler: reduce logical operation with already
+        evaluated operands.
+        """
+        right = values.pop()
+        left  = values.pop()
+        values.append(self.evaluate_binop_logical(node.operation, left, right))
+
+    def _reduce_comparison(self, node, values):
+        """
+        Iterative evaluation handler: reduce comparison operation with already
+        evaluated operands.
+        """
+        right = values.pop()
+        left  = values.pop()
+        values.append(self.evaluate_binop_comparison(node.operation, left, right))
+
+    def _reduce_math(self, node, values):
+        """
+        Iterative evaluation handler: reduce math operation with already
+        evaluated operands.
+        """
+        right = values.pop()
+        left  = values.pop()
+        values.append(self.evaluate_binop_math(node.operation, left, right))
+
+    def _reduce_unop(self, node, values):
+        """
+        Iterative evaluation handler: reduce unary operation with already
+        evaluated operand.
+        """
+        values.append(self.evaluate_unop(node.operation, values.pop()))
+
+    def _reduce_function(self, node, values):
+        """
+        Iterative evaluation handler: reduce function call with already
+        evaluated arguments.
+        """
+        args = values[len(values) - len(node.args):]
+        del values[len(values) - len(node.args):]
+        values.append(self.function(node, args))
+
+    _FILTER_EXPANDERS = {
+        LogicalBinOpRule:    _expand_binop,
+        ComparisonBinOpRule: _expand_binop,
+        MathBinOpRule:       _expand_binop,
+        UnaryOperationRule:  _expand_unop,
+        FunctionRule:        _expand_function,
+        VariableRule:        _expand_variable,
+        ListRule:            _expand_list,
+        ConstantRule:        _expand_value,
+        IPV4Rule:            _expand_value,
+        IPV6Rule:            _expand_value,
+        DatetimeRule:        _expand_value,
+        TimedeltaRule:       _expand_value,
+        IntegerRule:         _expand_value,
+        FloatRule:           _expand_value
+    }
+
+    _FILTER_REDUCERS = {
+        LogicalBinOpRule:    _reduce_logical,
+        ComparisonBinOpRule: _reduce_comparison,
+        MathBinOpRule:       _reduce_math,
+        UnaryOperationRule:  _reduce_unop,
+        FunctionRule:        _reduce_function
+    }
+
+    def prepare_callable(self, rule):
+        """
+        Precompile given filtering rule tree into a single callable object.
+
+        The returned callable takes the data structure to be filtered as its
+        only argument and produces the same result as calling the :py:func:`filter`
+        method with given rule. The rule tree is walked only once during the
+        precompilation and the evaluation itself is performed by nested closures,
+        which avoids the per-node traversal dispatch overhead. This is a worthwhile
+        optimization for the common use case of applying single rule to many
+        messages::
+
+        >>> flt = DataObjectFilter()
+        >>> fcbk = flt.prepare_callable(rule)
+        >>> result = fcbk(test_msg)
+
+        :param pynspect.rules.Rule rule: filtering rule to be precompiled
+        :return: callable object taking data structure as its only argument
+        :rtype: callable
+        """
+        cbk = self._prepare_callable(rule)
+        return lambda obj: cbk(obj, {})
+
+    def _prepare_callable(self, rule):
+        """
+        Recursively build evaluation closure for given rule tree node. The
+        closures take the filtered data structure and a dictionary for caching
+        JPath evaluations, which is allocated fresh for each filtered message
+        by the wrapper returned from :py:func:`prepare_callable`.
+        """
+        if isinstance(rule, LogicalBinOpRule):
+            operation = rule.operation
+            cbk_left  = self._prepare_callable(rule.left)
+            cbk_right = self._prepare_callable(rule.right)
+            return lambda obj, cache: self.evaluate_binop_logical(operation, cbk_left(obj, cache), cbk_right(obj, cache))
+
+        if isinstance(rule, ComparisonBinOpRule):
+            operation = rule.operation
+            cbk_left  = self._prepare_callable(rule.left)
+            cbk_right = self._prepare_callable(rule.right)
+            return lambda obj, cache: self.evaluate_binop_comparison(operation, cbk_left(obj, cache), cbk_right(obj, cache))
+
+        if isinstance(rule, MathBinOpRule):
+            operation = rule.operation
+            cbk_left  = self._prepare_callable(rule.left)
+            cbk_right = self._prepare_callable(rule.right)
+            return lambda obj, cache: self.evaluate_binop_math(operation, cbk_left(obj, cache), cbk_right(obj, cache))
+
+        if isinstance(rule, UnaryOperationRule):
+            operation = rule.operation
+            cbk_right = self._prepare_callable(rule.right)
+            return lambda obj, cache: self.evaluate_unop(operation, cbk_right(obj, cache))
+
+        if isinstance(rule, FunctionRule):
+            cbk_args = [self._prepare_callable(arg) for arg in rule.args]
+            return lambda obj, cache: self.function(rule, [cbk(obj, cache) for cbk in cbk_args])
+
+        if isinstance(rule, VariableRule):
+            path   = rule.value
+            parsed = getattr(rule, 'parsed_path', None)
+            if parsed is None:
+                parsed = jpath_parse_c(path)
+            def evaluate_variable(obj, cache):
+                if path in cache:
+                    return cache[path]
+                result = jpath_values_parsed(obj, parsed)
+                cache[path] = result
+                return result
+            return evaluate_variable
+
+        if isinstance(rule, ListRule):
+            values = rule.values()
+            return lambda obj, cache: values
+
+        if isinstance(rule, ValueRule):
+            value = rule.value
+            return lambda obj, cache: value
+
+        # Fall back to plain traversal for any other rule types (for example
+        # the pynspect.compilers.ConversionRule with custom traverse method).
+        return lambda obj, cache: rule.traverse(self, obj = obj)
+
+    def compile_to_source(self, rule, namespace = None):
+        """
+        Generate Python source code expression evaluating given filtering rule
+        against data structure bound to the ``obj`` name.
+
+        The generated expression is straight-line code calling directly the
+        evaluation helpers of this class, so executing it skips the whole rule
+        tree traversal machinery. Constants, that cannot be safely inlined as
+        Python literals, and the helper callbacks themselves are registered
+        into given namespace dictionary under generated names. That namespace
+        must then be used as globals when compiling and executing the source.
+
+        :param pynspect.rules.Rule rule: filtering rule to be processed
+        :param dict namespace: namespace dictionary to be populated with referenced objects
+        :return: Python source code expression
+        :rtype: str
+        """
+        if namespace is None:
+            namespace = {}
+        self._register_codegen_helpers(namespace)
+        return self._code_for_rule(rule, namespace)
+
+    def prepare_compiled(self, rule):
+        """
+        Precompile given filtering rule tree into native Python code.
+
+        This goes one step further than :py:func:`prepare_callable`: the rule
+        tree is translated into a single Python expression by the
+        :py:func:`compile_to_source` method and compiled into one straight-line
+        function, so there is no per-node call dispatch left at all during the
+        evaluation. The compiled function embeds the evaluation helpers and the
+        registered function callbacks of this particular filter instance, so it
+        is cached on the rule object together with a reference to the owning
+        instance and repeated calls with the same rule and filter are cheap::
+
+        >>> flt = DataObjectFilter()
+        >>> fcbk = flt.prepare_compiled(rule)
+        >>> result = fcbk(test_msg)
+
+        :param pynspect.rules.Rule rule: filtering rule to be precompiled
+        :return: callable object taking data structure as its only argument
+        :rtype: callable
+        """
+        cached = getattr(rule, '_compiled_callable', None)
+        if cached is not None and cached[0] is self:
+            return cached[1]
+        namespace = {}
+        source = self.compile_to_source(rule, namespace)
+        cbk = eval(  # pylint: disable=locally-disabled,eval-used
+            compile('lambda obj: {}'.format(source), '<pynspect-filter>', 'eval'),
+            namespace
+        )
+        rule._compiled_callable = (self, cbk)  # pylint: disable=locally-disabled,protected-access
+        return cbk
+
+    def _register_codegen_helpers(self, namespace):
+        """
+        Register all helper callbacks referenced by generated source code into
+        given namespace dictionary.
+        """
+        namespace.update(
+            _flt = self,
+            _ebl = self.evaluate_binop_logical,
+            _ebc = self.evaluate_binop_comparison,
+            _ebm = self.evaluate_binop_math,
+            _euo = self.evaluate_unop,
+            _fnc = self.function,
+            _jpv = jpath_values
+        )
+
+    def _code_for_rule(self, rule, namespace):
+        """
+        Recursively generate source code expression for given rule tree node.
+        """
+        if isinstance(rule, LogicalBinOpRule):
+            return '_ebl({!r}, {}, {})'.format(rule.operation, self._code_for_rule(rule.left, namespace), self._code_for_rule(rule.right, namespace))
+
+        if isinstance(rule, ComparisonBinOpRule):
+            return '_ebc({!r}, {}, {})'.format(rule.operation, self._code_for_rule(rule.left, namespace), self._code_for_rule(rule.right, namespace))
+
+        if isinstance(rule, MathBinOpRule):
+            return '_ebm({!r}, {}, {})'.format(rule.operation, self._code_for_rule(rule.left, namespace), self._code_for_rule(rule.right, namespace))
+
+        if isinstance(rule, UnaryOperationRule):
+            return '_euo({!r}, {})'.format(rule.operation, self._code_for_rule(rule.right, namespace))
+
+        if isinstance(rule, FunctionRule):
+            return '_fnc({}, [{}])'.format(self._code_for_const(rule, namespace), ', '.join(self._code_for_rule(arg, namespace) for arg in rule.args))
+
+        if isinstance(rule, VariableRule):
+            return '_jpv(obj, {!r})'.format(rule.value)
+
+        if isinstance(rule, ListRule):
+            return self._code_for_const(rule.values(), namespace)
+
+        if isinstance(rule, ValueRule):
+            return self._code_for_const(rule.value, namespace)
+
+        # Fall back to plain traversal for any other rule types (for example
+        # the pynspect.compilers.ConversionRule with custom traverse method).
+        return '{}.traverse(_flt, obj = obj)'.format(self._code_for_const(rule, namespace))
+
+    @staticmethod
+    def _code_for_const(value, namespace):
+        """
+        Generate source code expression for given constant value. Simple scalar
+        constants are inlined as Python literals, everything else is registered
+        into given namespace dictionary under a generated name.
+        """
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return repr(value)
+        name = '_const{:d}'.format(len(namespace))
+        namespace[name] = value
+        return name
+
+    #---------------------------------------------------------------------------
+
+    def ipv4(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.ipv4` interface.
         """
         return rule.value
 
-    def ipv6(self, rule, **kwargs):
+    def ipv6(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.ipv6` interface.
         """
         return rule.value
 
-    def datetime(self, rule, **kwargs):
+    def datetime(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.datetime` interface.
         """
         return rule.value
 
-    def timedelta(self, rule, **kwargs):
+    def timedelta(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.timedelta` interface.
         """
         return rule.value
 
-    def integer(self, rule, **kwargs):
+    def integer(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.integer` interface.
         """
         return rule.value
 
-    def float(self, rule, **kwargs):
+    def float(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.float` interface.
         """
         return rule.value
 
-    def constant(self, rule, **kwargs):
+    def constant(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.constant` interface.
         """
         return rule.value
 
-    def variable(self, rule, **kwargs):
+    def variable(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.variable` interface.
         """
-        return jpath_values(kwargs['obj'], rule.value)
-
-    def list(self, rule, **kwargs):
+        # Use the JPath pre-parsed at compile time when available, so the path
+        # string does not have to be parsed or looked up in the parser cache
+        # for every processed message.
+        parsed = getattr(rule, 'parsed_path', None)
+        if parsed is None:
+            parsed = jpath_parse_c(rule.value)
+        return jpath_values_parsed(obj, parsed)
+
+    def list(self, rule, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.list` interface.
         """
         return rule.values()
 
-    def binary_operation_logical(self, rule, left, right, **kwargs):
+    def binary_operation_logical(self, rule, left, right, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_logical` interface.
         """
-        return self.evaluate_binop_logical(rule.operation, left, right, **kwargs)
+        return self.evaluate_binop_logical(rule.operation, left, right)
 
-    def binary_operation_comparison(self, rule, left, right, **kwargs):
+    def binary_operation_comparison(self, rule, left, right, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_comparison` interface.
         """
-        return self.evaluate_binop_comparison(rule.operation, left, right, **kwargs)
+        return self.evaluate_binop_comparison(rule.operation, left, right)
 
-    def binary_operation_math(self, rule, left, right, **kwargs):
+    def binary_operation_math(self, rule, left, right, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.binary_operation_math` interface.
         """
-        return self.evaluate_binop_math(rule.operation, left, right, **kwargs)
+        return self.evaluate_binop_math(rule.operation, left, right)
 
-    def unary_operation(self, rule, right, **kwargs):
+    def unary_operation(self, rule, right, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.unary_operation` interface.
         """
-        return self.evaluate_unop(rule.operation, right, **kwargs)
+        return self.evaluate_unop(rule.operation, right)
 
 
 #-------------------------------------------------------------------------------
@@ -253,11 +253,26 @@ def jpath_values(structure, jpath):
     """
     Return all values at given JPath within given data structure.
 
+    :param str structure: data structure to be searched
+    :param str jpath: JPath to be evaluated
+    :return: found values as a list
+    :rtype: :py:class:`list`
+    """
+    return jpath_values_parsed(structure, jpath_parse_c(jpath))
+
+
+def jpath_values_parsed(structure, chunks):
+    """
+    Return all values at JPath given in already parsed form within given data
+    structure. This variant skips the JPath string parsing (and its cache
+    lookup) entirely, so callers evaluating the same JPath repeatedly may parse
+    it once with :py:func:`jpath_parse` and pass the chunks directly.
+
     For performance reasons this method is intentionally not written as
     recursive.
 
     :param str structure: data structure to be searched
-    :param str jpath: JPath to be evaluated
+    :param list chunks: JPath chunks as returned by :py:func:`jpath_parse`
     :return: found values as a list
     :rtype: :py:class:`list`
     """
@@ -268,12 +283,11 @@ def jpath_values(structure, jpath):
     nodes_b = []
 
     # Process sequentially all JPath chunks.
-    chunks = jpath_parse_c(jpath)
     for chnk in chunks:
         # Process all currently active nodes.
         for node in nodes_a:
             key = chnk['n']
-            if not isinstance(node, dict) and not isinstance(node, collections.Mapping):
+            if not isinstance(node, dict) and not isinstance(node, collections.abc.Mapping):
                 continue
 
             # Process indexed nodes.
@@ -281,7 +295,7 @@ def jpath_values(structure, jpath):
                 idx = chnk['i']
                 # Skip the node, if the key does not exist, the value is not
                 # a list-like object or the list is empty.
-                if not key in node or not (isinstance(node[key], (list, collections.MutableSequence))) or not node[key]:
+                if not key in node or not (isinstance(node[key], (list, collections.abc.MutableSequence))) or not node[key]:
                     continue
                 try:
                     # Handle '*' special index - append all nodes.
@@ -300,7 +314,7 @@ def jpath_values(structure, jpath):
                     continue
 
                 # Handle list values - expand them.
-                if isinstance(node[key], (list, collections.MutableSequence)):
+                if isinstance(node[key], (list, collections.abc.MutableSequence)):
                     for i in node[key]:
                         nodes_b.append(i)
                 # Handle scalar values.
@@ -369,7 +383,7 @@ def jpath_set(structure, jpath, value, overwrite = True, unique = False):
     for i, chnk in enumerate(chunks):
         key = chnk['n']
 
-        if not isinstance(current, dict) and not isinstance(current, collections.Mapping):
+        if not isinstance(current, dict) and not isinstance(current, collections.abc.Mapping):
             raise JPathException("Expected dict-like structure to attach node '{}'".format(chnk['p']))
 
         # Process indexed nodes.
@@ -379,7 +393,7 @@ def jpath_set(structure, jpath, value, overwrite = True, unique = False):
             # Automatically create nodes for non-existent keys.
             if not key in current:
                 current[key] = []
-            if not isinstance(current[key], list) and not isinstance(current[key], collections.MutableSequence):
+            if not isinstance(current[key], list) and not isinstance(current[key], collections.abc.MutableSequence):
                 raise JPathException("Expected list-like object under structure key '{}'".format(key))
 
             # Detection of the last JPath chunk - node somewhere in the middle.
@@ -426,7 +440,7 @@ def jpath_set(structure, jpath, value, overwrite = True, unique = False):
                 # Automatically create nodes for non-existent keys.
                 if not key in current:
                     current[key] = {}
-                if not isinstance(current[key], dict) and not isinstance(current[key], collections.Mapping):
+                if not isinstance(current[key], dict) and not isinstance(current[key], collections.abc.Mapping):
                     raise JPathException("Expected dict-like object under structure key '{}'".format(key))
 
                 current = current[key]
@@ -464,7 +478,7 @@ def jpath_unset(structure, jpath):
         for node in nodes_a:
             key = chnk['n']
 
-            if not isinstance(node, dict) and not isinstance(node, collections.Mapping):
+            if not isinstance(node, dict) and not isinstance(node, collections.abc.Mapping):
                 raise JPathException("Expected dict-like structure to drop node '{}'".format(chnk['p']))
 
             # Process indexed nodes.
@@ -474,7 +488,7 @@ def jpath_unset(structure, jpath):
                 # Skip nodes for non-existent keys.
                 if not key in node:
                     continue
-                if not isinstance(node[key], list) and not isinstance(node[key], collections.MutableSequence):
+                if not isinstance(node[key], list) and not isinstance(node[key], collections.abc.MutableSequence):
                     raise JPathException("Expected list-like object under structure key '{}'".format(key))
 
                 # Detection of the last JPath chunk - node somewhere in the middle.
@@ -513,7 +527,7 @@ def jpath_unset(structure, jpath):
                     if isinstance(node[key], list):
                         nodes_b.extend(node[key])
                         continue
-                    if not isinstance(node[key], dict) and not isinstance(node[key], collections.Mapping):
+                    if not isinstance(node[key], dict) and not isinstance(node[key], collections.abc.Mapping):
                         raise JPathException("Expected dict-like object under structure key '{}'".format(key))
                     nodes_b.append(node[key])
 
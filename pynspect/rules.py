@@ -157,15 +157,15 @@ class Rule(object):
     """
     Base class for all filter tree rules.
     """
-    def traverse(self, traverser, **kwargs):
+    def traverse(self, traverser, obj = None):
         """
         Mandatory interface for traversing the whole rule tree. This method must
         call apropriate method of given traverser object with apropriate arguments.
-        The optional ``kwargs`` are passed down to traverser callback as additional
-        arguments and can be used to provide additional data or context.
+        The optional ``obj`` argument is passed down to traverser callback and can
+        be used to provide the processed data structure or other context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
-        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        :param obj: Additional optional data structure to be passed down to traverser callback.
         """
         raise NotImplementedError()
 
@@ -193,18 +193,18 @@ class VariableRule(ValueRule):
     def __repr__(self):
         return "VARIABLE({})".format(repr(self.value))
 
-    def traverse(self, traverser, **kwargs):
+    def traverse(self, traverser, obj = None):
         """
         Implementation of mandatory interface for traversing the whole rule tree.
         This method will call the implementation of :py:func:`pynspect.rules.RuleTreeTraverser.variable`
         method with reference to ``self`` instance as first argument. The optional
-        ``kwargs`` are passed down to traverser callback as additional arguments
-        and can be used to provide additional data or context.
+        ``obj`` argument is passed down to traverser callback and can be used to
+        provide the processed data structure or other context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
-        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        :param obj: Additional optional data structure to be passed down to traverser callback.
         """
-        return traverser.variable(self, **kwargs)
+        return traverser.variable(self, obj)
 
 
 class ConstantRule(ValueRule):
@@ -217,18 +217,18 @@ class ConstantRule(ValueRule):
     def __repr__(self):
         return "CONSTANT({})".format(repr(self.value))
 
-    def traverse(self, traverser, **kwargs):
+    def traverse(self, traverser, obj = None):
         """
         Implementation of mandatory interface for traversing the whole rule tree.
         This method will call the implementation of :py:func:`pynspect.rules.RuleTreeTraverser.constant`
         method with reference to ``self`` instance as first argument. The optional
-        ``kwargs`` are passed down to traverser callback as additional arguments
-        and can be used to provide additional data or context.
+        ``obj`` argument is passed down to traverser callback and can be used to
+        provide the processed data structure or other context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
-        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        :param obj: Additional optional data structure to be passed down to traverser callback.
         """
-        return traverser.constant(self, **kwargs)
+        return traverser.constant(self, obj)
 
 
 class IPV4Rule(ConstantRule):
@@ -241,18 +241,18 @@ class IPV4Rule(ConstantRule):
     def __repr__(self):
         return "IPV4({})".format(repr(self.value))
 
-    def traverse(self, traverser, **kwargs):
+    def traverse(self, traverser, obj = None):
         """
         Implementation of mandatory interface for traversing the whole rule tree.
         This method will call the implementation of :py:func:`pynspect.rules.RuleTreeTraverser.ipv4`
         method with reference to ``self`` instance as first argument. The optional
-        ``kwargs`` are passed down to traverser callback as additional arguments
-        and can be used to provide additional data or context.
+        ``obj`` argument is passed down to traverser callback and can be used to
+        provide the processed data structure or other context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
-        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        :param obj: Additional optional data structure to be passed down to traverser callback.
         """
-        return traverser.ipv4(self, **kwargs)
+        return traverser.ipv4(self, obj)
 
 
 class IPV6Rule(ConstantRule):
@@ -265,18 +265,18 @@ class IPV6Rule(ConstantRule):
     def __repr__(self):
         return "IPV6({})".format(repr(self.value))
 
-    def traverse(self, traverser, **kwargs):
+    def traverse(self, traverser, obj = None):
         """
         Implementation of mandatory interface for traversing the whole rule tree.
         This method will call the implementation of :py:func:`pynspect.rules.RuleTreeTraverser.ipv6`
         method with reference to ``self`` instance as first argument. The optional
-        ``kwargs`` are passed down to traverser callback as additional arguments
-        and can be used to provide additional data or context.
+        ``obj`` argument is passed down to traverser callback and can be used to
+        provide the processed data structure or other context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
-        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        :param obj: Additional optional data structure to be passed down to traverser callback.
         """
-        return traverser.ipv6(self, **kwargs)
+        return traverser.ipv6(self, obj)
 
 
 class DatetimeRule(ConstantRule):
@@ -289,18 +289,18 @@ class DatetimeRule(ConstantRule):
     def __repr__(self):
         return "DATETIME({})".format(repr(self.value))
 
-    def traverse(self, traverser, **kwargs):
+    def traverse(self, traverser, obj = None):
         """
         Implementation of mandatory interface for traversing the whole rule tree.
         This method will call the implementation of :py:func:`pynspect.rules.RuleTreeTraverser.datetime`
         method with reference to ``self`` instance as first argument. The optional
-        ``kwargs`` are passed down to traverser callback as additional arguments
-        and can be used to provide additional data or context.
+        ``obj`` argument is passed down to traverser callback and can be used to
+        provide the processed data structure or other context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
-        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        :param obj: Additional optional data structure to be passed down to traverser callback.
         """
-        return traverser.datetime(self, **kwargs)
+        return traverser.datetime(self, obj)
 
 
 class TimedeltaRule(ConstantRule):
@@ -313,18 +313,18 @@ class TimedeltaRule(ConstantRule):
     def __repr__(self):
         return "TIMEDELTA({})".format(repr(self.value))
 
-    def traverse(self, traverser, **kwargs):
+    def traverse(self, traverser, obj = None):
         """
         Implementation of mandatory interface for traversing the whole rule tree.
         This method will call the implementation of :py:func:`pynspect.rules.RuleTreeTraverser.timedelta`
         method with reference to ``self`` instance as first argument. The optional
-        ``kwargs`` are passed down to traverser callback as additional arguments
-        and can be used to provide additional data or context.
+        ``obj`` argument is passed down to traverser callback and can be used to
+        provide the processed data structure or other context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
-        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        :param obj: Additional optional data structure to be passed down to traverser callback.
         """
-        return traverser.timedelta(self, **kwargs)
+        return traverser.timedelta(self, obj)
 
 
 class NumberRule(ConstantRule):
@@ -342,18 +342,18 @@ class IntegerRule(NumberRule):
     def __repr__(self):
         return "INTEGER({})".format(repr(self.value))
 
-    def traverse(self, traverser, **kwargs):
+    def traverse(self, traverser, obj = None):
         """
         Implementation of mandatory interface for traversing the whole rule tree.
         This method will call the implementation of :py:func:`pynspect.rules.RuleTreeTraverser.integer`
         method with reference to ``self`` instance as first argument. The optional
-        ``kwargs`` are passed down to traverser callback as additional arguments
-        and can be used to provide additional data or context.
+        ``obj`` argument is passed down to traverser callback and can be used to
+        provide the processed data structure or other context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
-        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        :param obj: Additional optional data structure to be passed down to traverser callback.
         """
-        return traverser.integer(self, **kwargs)
+        return traverser.integer(self, obj)
 
 
 class FloatRule(NumberRule):
@@ -363,18 +363,18 @@ class FloatRule(NumberRule):
     def __repr__(self):
         return "FLOAT({})".format(repr(self.value))
 
-    def traverse(self, traverser, **kwargs):
+    def traverse(self, traverser, obj = None):
         """
         Implementation of mandatory interface for traversing the whole rule tree.
         This method will call the implementation of :py:func:`pynspect.rules.RuleTreeTraverser.float`
         method with reference to ``self`` instance as first argument. The optional
-        ``kwargs`` are passed down to traverser callback as additional arguments
-        and can be used to provide additional data or context.
+        ``obj`` argument is passed down to traverser callback and can be used to
+        provide the processed data structure or other context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
-        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        :param obj: Additional optional data structure to be passed down to traverser callback.
         """
-        return traverser.float(self, **kwargs)
+        return traverser.float(self, obj)
 
 
 class ListRule(ValueRule):
@@ -408,18 +408,18 @@ class ListRule(ValueRule):
         """
         return [i.value for i in self.value]
 
-    def traverse(self, traverser, **kwargs):
+    def traverse(self, traverser, obj = None):
         """
         Implementation of mandatory interface for traversing the whole rule tree.
         This method will call the implementation of :py:func:`pynspect.rules.RuleTreeTraverser.list`
         method with reference to ``self`` instance as first argument. The optional
-        ``kwargs`` are passed down to traverser callback as additional arguments
-        and can be used to provide additional data or context.
+        ``obj`` argument is passed down to traverser callback and can be used to
+        provide the processed data structure or other context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
-        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        :param obj: Additional optional data structure to be passed down to traverser callback.
         """
-        return traverser.list(self, **kwargs)
+        return traverser.list(self, obj)
 
 
 class OperationRule(Rule):  # pylint: disable=locally-disabled,abstract-method
@@ -456,22 +456,22 @@ class LogicalBinOpRule(BinaryOperationRule):
     def __repr__(self):
         return "LOGBINOP({} {} {})".format(repr(self.left), str(self.operation), repr(self.right))
 
-    def traverse(self, traverser, **kwargs):
+    def traverse(self, traverser, obj = None):
         """
         Implementation of mandatory interface for traversing the whole rule tree.
         This method will call the implementation of :py:func:`pynspect.rules.RuleTreeTraverser.binary_operation_logical`
         method with reference to ``self`` instance as first argument, with the
         result of traversing left subtree as second argument and with the result
-        of traversing right subtree as third argument. The optional ``kwargs``
-        are passed down to traverser callback as additional arguments and can be
-        used to provide additional data or context.
+        of traversing right subtree as third argument. The optional ``obj``
+        argument is passed down to traverser callback and can be used to provide
+        the processed data structure or other context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
-        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        :param obj: Additional optional data structure to be passed down to traverser callback.
         """
-        lrt = self.left.traverse(traverser, **kwargs)
-        rrt = self.right.traverse(traverser, **kwargs)
-        return traverser.binary_operation_logical(self, lrt, rrt, **kwargs)
+        lrt = self.left.traverse(traverser, obj)
+        rrt = self.right.traverse(traverser, obj)
+        return traverser.binary_operation_logical(self, lrt, rrt, obj)
 
 
 class ComparisonBinOpRule(BinaryOperationRule):
@@ -481,22 +481,22 @@ class ComparisonBinOpRule(BinaryOperationRule):
     def __repr__(self):
         return "COMPBINOP({} {} {})".format(repr(self.left), str(self.operation), repr(self.right))
 
-    def traverse(self, traverser, **kwargs):
+    def traverse(self, traverser, obj = None):
         """
         Implementation of mandatory interface for traversing the whole rule tree.
         This method will call the implementation of :py:func:`pynspect.rules.RuleTreeTraverser.binary_operation_comparison`
         method with reference to ``self`` instance as first argument, with the
         result of traversing left subtree as second argument and with the result
-        of traversing right subtree as third argument. The optional ``kwargs``
-        are passed down to traverser callback as additional arguments and can be
-        used to provide additional data or context.
+        of traversing right subtree as third argument. The optional ``obj``
+        argument is passed down to traverser callback and can be used to provide
+        the processed data structure or other context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
-        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        :param obj: Additional optional data structure to be passed down to traverser callback.
         """
-        lrt = self.left.traverse(traverser, **kwargs)
-        rrt = self.right.traverse(traverser, **kwargs)
-        return traverser.binary_operation_comparison(self, lrt, rrt, **kwargs)
+        lrt = self.left.traverse(traverser, obj)
+        rrt = self.right.traverse(traverser, obj)
+        return traverser.binary_operation_comparison(self, lrt, rrt, obj)
 
 
 class MathBinOpRule(BinaryOperationRule):
@@ -506,22 +506,22 @@ class MathBinOpRule(BinaryOperationRule):
     def __repr__(self):
         return "MATHBINOP({} {} {})".format(repr(self.left), str(self.operation), repr(self.right))
 
-    def traverse(self, traverser, **kwargs):
+    def traverse(self, traverser, obj = None):
         """
         Implementation of mandatory interface for traversing the whole rule tree.
         This method will call the implementation of :py:func:`pynspect.rules.RuleTreeTraverser.binary_operation_math`
         method with reference to ``self`` instance as first argument, with the
         result of traversing left subtree as second argument and with the result
-        of traversing right subtree as third argument. The optional ``kwargs``
-        are passed down to traverser callback as additional arguments and can be
-        used to provide additional data or context.
+        of traversing right subtree as third argument. The optional ``obj``
+        argument is passed down to traverser callback and can be used to provide
+        the processed data structure or other context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
-        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        :param obj: Additional optional data structure to be passed down to traverser callback.
         """
-        lrt = self.left.traverse(traverser, **kwargs)
-        rrt = self.right.traverse(traverser, **kwargs)
-        return traverser.binary_operation_math(self, lrt, rrt, **kwargs)
+        lrt = self.left.traverse(traverser, obj)
+        rrt = self.right.traverse(traverser, obj)
+        return traverser.binary_operation_math(self, lrt, rrt, obj)
 
 
 class UnaryOperationRule(OperationRule):
@@ -544,20 +544,20 @@ class UnaryOperationRule(OperationRule):
     def __repr__(self):
         return "UNOP({} {})".format(str(self.operation), repr(self.right))
 
-    def traverse(self, traverser, **kwargs):
+    def traverse(self, traverser, obj = None):
         """
         Implementation of mandatory interface for traversing the whole rule tree.
         This method will call the implementation of :py:func:`pynspect.rules.RuleTreeTraverser.binary_operation_logical`
         method with reference to ``self`` instance as first argument and with the
-        result of traversing left subtree as second argument. The optional ``kwargs``
-        are passed down to traverser callback as additional arguments and can be
-        used to provide additional data or context.
+        result of traversing left subtree as second argument. The optional ``obj``
+        argument is passed down to traverser callback and can be used to provide
+        the processed data structure or other context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
-        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        :param obj: Additional optional data structure to be passed down to traverser callback.
         """
-        rrt = self.right.traverse(traverser, **kwargs)
-        return traverser.unary_operation(self, rrt, **kwargs)
+        rrt = self.right.traverse(traverser, obj)
+        return traverser.unary_operation(self, rrt, obj)
 
 
 class FunctionRule(Rule):
@@ -580,22 +580,22 @@ class FunctionRule(Rule):
     def __repr__(self):
         return "FUNCTION({}{})".format(str(self.function), repr(self.args))
 
-    def traverse(self, traverser, **kwargs):
+    def traverse(self, traverser, obj = None):
         """
         Implementation of mandatory interface for traversing the whole rule tree.
         This method will call the implementation of :py:func:`pynspect.rules.RuleTreeTraverser.function`
         method with reference to ``self`` instance as first argument and with the
-        result of traversing left subtree as second argument. The optional ``kwargs``
-        are passed down to traverser callback as additional arguments and can be
-        used to provide additional data or context.
+        result of traversing left subtree as second argument. The optional ``obj``
+        argument is passed down to traverser callback and can be used to provide
+        the processed data structure or other context.
 
         :param pynspect.rules.RuleTreeTraverser traverser: Traverser object providing appropriate interface.
-        :param dict kwargs: Additional optional keyword arguments to be passed down to traverser callback.
+        :param obj: Additional optional data structure to be passed down to traverser callback.
         """
         atr = []
         for arg in self.args:
-            atr.append(arg.traverse(traverser, **kwargs))
-        return traverser.function(self, atr, **kwargs)
+            atr.append(arg.traverse(traverser, obj))
+        return traverser.function(self, atr, obj)
 
 #-------------------------------------------------------------------------------
 
@@ -129,23 +129,23 @@ class TestIDEAFilterCompiler(unittest.TestCase):
         )
         self.assertEqual(
             repr(compile_timedelta(NumberRule('3600'))),
-            "TIMEDELTA(datetime.timedelta(0, 3600))"
+            "TIMEDELTA(datetime.timedelta(seconds=3600))"
         )
         self.assertEqual(
             repr(compile_timedelta(ConstantRule('3600'))),
-            "TIMEDELTA(datetime.timedelta(0, 3600))"
+            "TIMEDELTA(datetime.timedelta(seconds=3600))"
         )
         self.assertEqual(
             repr(compile_timedelta(ConstantRule('15:15:15'))),
-            "TIMEDELTA(datetime.timedelta(0, 54915))"
+            "TIMEDELTA(datetime.timedelta(seconds=54915))"
         )
         self.assertEqual(
             repr(compile_timedelta(ConstantRule('15D15:15:15'))),
-            "TIMEDELTA(datetime.timedelta(15, 54915))"
+            "TIMEDELTA(datetime.timedelta(days=15, seconds=54915))"
         )
         self.assertEqual(
             repr(compile_timedelta(ConstantRule('15d15:15:15'))),
-            "TIMEDELTA(datetime.timedelta(15, 54915))"
+            "TIMEDELTA(datetime.timedelta(days=15, seconds=54915))"
         )
         self.assertEqual(
             repr(compile_timeoper(ConstantRule('2016-06-21T13:08:27Z'))),
@@ -157,19 +157,19 @@ class TestIDEAFilterCompiler(unittest.TestCase):
         )
         self.assertEqual(
             repr(compile_timeoper(NumberRule('3600'))),
-            "TIMEDELTA(datetime.timedelta(0, 3600))"
+            "TIMEDELTA(datetime.timedelta(seconds=3600))"
         )
         self.assertEqual(
             repr(compile_timeoper(ConstantRule('15:15:15'))),
-            "TIMEDELTA(datetime.timedelta(0, 54915))"
+            "TIMEDELTA(datetime.timedelta(seconds=54915))"
         )
         self.assertEqual(
             repr(compile_timeoper(ConstantRule('15D15:15:15'))),
-            "TIMEDELTA(datetime.timedelta(15, 54915))"
+            "TIMEDELTA(datetime.timedelta(days=15, seconds=54915))"
         )
         self.assertEqual(
             repr(compile_timeoper(ConstantRule('15d15:15:15'))),
-            "TIMEDELTA(datetime.timedelta(15, 54915))"
+            "TIMEDELTA(datetime.timedelta(days=15, seconds=54915))"
         )
 
 
@@ -346,12 +346,55 @@ class TestIDEAFilterCompiler(unittest.TestCase):
         rule = psr.parse('(DetectTime < (utcnow() - 3600))')
         self.assertEqual(repr(rule), "COMPBINOP(VARIABLE('DetectTime') OP_LT MATHBINOP(FUNCTION(utcnow()) OP_MINUS INTEGER(3600)))")
         res = cpl.compile(rule)
-        self.assertEqual(repr(res), "COMPBINOP(VARIABLE('DetectTime') OP_LT MATHBINOP(FUNCTION(utcnow()) OP_MINUS TIMEDELTA(datetime.timedelta(0, 3600))))")
+        self.assertEqual(repr(res), "COMPBINOP(VARIABLE('DetectTime') OP_LT MATHBINOP(FUNCTION(utcnow()) OP_MINUS TIMEDELTA(datetime.timedelta(seconds=3600))))")
 
         rule = psr.parse('(DetectTime + 3600) > utcnow()')
         self.assertEqual(repr(rule), "COMPBINOP(MATHBINOP(VARIABLE('DetectTime') OP_PLUS INTEGER(3600)) OP_GT FUNCTION(utcnow()))")
         res = cpl.compile(rule)
-        self.assertEqual(repr(res), "COMPBINOP(MATHBINOP(VARIABLE('DetectTime') OP_PLUS TIMEDELTA(datetime.timedelta(0, 3600))) OP_GT FUNCTION(utcnow()))")
+        self.assertEqual(repr(res), "COMPBINOP(MATHBINOP(VARIABLE('DetectTime') OP_PLUS TIMEDELTA(datetime.timedelta(seconds=3600))) OP_GT FUNCTION(utcnow()))")
+
+    def test_06_constant_folding(self):
+        """
+        Perform tests of compile time constant folding.
+        """
+        self.maxDiff = None
+
+        cpl = IDEAFilterCompiler()
+        psr = PynspectFilterParser()
+        psr.build()
+
+        rule = psr.parse('((1+2)+3) > ConnCount')
+        self.assertEqual(repr(cpl.compile(rule)), "COMPBINOP(VARIABLE('ConnCount') OP_GT INTEGER(6))")
+        rule = psr.parse('1 > 2')
+        self.assertEqual(repr(cpl.compile(rule)), "CONSTANT(False)")
+        rule = psr.parse('not (1 > 2)')
+        self.assertEqual(repr(cpl.compile(rule)), "CONSTANT(True)")
+        rule = psr.parse('(1 > 2) or (ConnCount > 1)')
+        self.assertEqual(repr(cpl.compile(rule)), "COMPBINOP(VARIABLE('ConnCount') OP_GT INTEGER(1))")
+        rule = psr.parse('(2 > 1) or (ConnCount > 1)')
+        self.assertEqual(repr(cpl.compile(rule)), "CONSTANT(True)")
+        rule = psr.parse('(2 > 1) and (ConnCount > 1)')
+        self.assertEqual(repr(cpl.compile(rule)), "COMPBINOP(VARIABLE('ConnCount') OP_GT INTEGER(1))")
+        rule = psr.parse('(1 > 2) and (ConnCount > 1)')
+        self.assertEqual(repr(cpl.compile(rule)), "CONSTANT(False)")
+
+    def test_07_frozenset_compilations(self):
+        """
+        Perform tests of list to frozenset compilations.
+        """
+        self.maxDiff = None
+
+        cpl = IDEAFilterCompiler()
+        psr = PynspectFilterParser()
+        psr.build()
+
+        # Membership tests may use the unordered frozenset.
+        rule = psr.parse('DetectTime in ["2016-06-21T13:08:27Z"]')
+        self.assertEqual(repr(cpl.compile(rule)), "COMPBINOP(VARIABLE('DetectTime') OP_IN FROZENSET(DATETIME(datetime.datetime(2016, 6, 21, 13, 8, 27))))")
+
+        # Whole list comparisons are order sensitive and must keep the list.
+        rule = psr.parse('DetectTime is ["2016-06-21T13:08:27Z", "2017-01-01T00:00:00Z"]')
+        self.assertEqual(repr(cpl.compile(rule)), "COMPBINOP(VARIABLE('DetectTime') OP_IS LIST(DATETIME(datetime.datetime(2016, 6, 21, 13, 8, 27)), DATETIME(datetime.datetime(2017, 1, 1, 0, 0))))")
 
 
 #-------------------------------------------------------------------------------
@@ -369,6 +369,58 @@ class TestDataObjectFilter(unittest.TestCase):
         self.assertEqual(repr(rule), "COMPBINOP(FUNCTION(time()) OP_GT FLOAT(500.12))")
         self.assertEqual(self.flt.filter(rule, self.test_msg1), True)
 
+    def test_09_prepare_callable(self):
+        """
+        Perform filtering tests with rules precompiled into callables.
+        """
+        self.maxDiff = None
+
+        rule = self.psr.parse('ID == "e214d2d9-359b-443d-993d-3cc5637107a0"')
+        self.assertEqual(self.flt.prepare_callable(rule)(self.test_msg1), True)
+        rule = self.psr.parse('ID eq "e214d2d9-359b-443d-993d-3cc5637107"')
+        self.assertEqual(self.flt.prepare_callable(rule)(self.test_msg1), False)
+        rule = self.psr.parse('Category in ["Phishing" , "Attempt.Login"]')
+        self.assertEqual(self.flt.prepare_callable(rule)(self.test_msg1), True)
+        rule = self.psr.parse('Category IN ["Phishing" , "Spam"]')
+        self.assertEqual(self.flt.prepare_callable(rule)(self.test_msg1), False)
+        rule = self.psr.parse('((ConnCount + 3) < 5) or ((ConnCount + 10) > 11)')
+        self.assertEqual(self.flt.prepare_callable(rule)(self.test_msg1), True)
+        rule = self.psr.parse('not Target.Anonymised')
+        self.assertEqual(self.flt.prepare_callable(rule)(self.test_msg1), False)
+        rule = self.psr.parse('(size(Node.Type) > 2)')
+        self.assertEqual(self.flt.prepare_callable(rule)(self.test_msg1), True)
+        rule = self.psr.parse('(ConnCounts + 10) > 11')
+        self.assertEqual(self.flt.prepare_callable(rule)(self.test_msg1), None)
+
+    def test_10_prepare_compiled(self):
+        """
+        Perform filtering tests with rules precompiled into native Python code.
+        """
+        self.maxDiff = None
+
+        rule = self.psr.parse('ID == "e214d2d9-359b-443d-993d-3cc5637107a0"')
+        self.assertEqual(self.flt.compile_to_source(rule), "_ebc('OP_EQ', _jpv(obj, 'ID'), 'e214d2d9-359b-443d-993d-3cc5637107a0')")
+        self.assertEqual(self.flt.prepare_compiled(rule)(self.test_msg1), True)
+        rule = self.psr.parse('ID eq "e214d2d9-359b-443d-993d-3cc5637107"')
+        self.assertEqual(self.flt.prepare_compiled(rule)(self.test_msg1), False)
+        rule = self.psr.parse('Category in ["Phishing" , "Attempt.Login"]')
+        self.assertEqual(self.flt.prepare_compiled(rule)(self.test_msg1), True)
+        rule = self.psr.parse('Category IN ["Phishing" , "Spam"]')
+        self.assertEqual(self.flt.prepare_compiled(rule)(self.test_msg1), False)
+        rule = self.psr.parse('((ConnCount + 3) < 5) or ((ConnCount + 10) > 11)')
+        self.assertEqual(self.flt.compile_to_source(rule), "_ebl('OP_OR', _ebc('OP_LT', _ebm('OP_PLUS', _jpv(obj, 'ConnCount'), 3), 5), _ebc('OP_GT', _ebm('OP_PLUS', _jpv(obj, 'ConnCount'), 10), 11))")
+        self.assertEqual(self.flt.prepare_compiled(rule)(self.test_msg1), True)
+        rule = self.psr.parse('not Target.Anonymised')
+        self.assertEqual(self.flt.prepare_compiled(rule)(self.test_msg1), False)
+        rule = self.psr.parse('(size(Node.Type) > 2)')
+        self.assertEqual(self.flt.prepare_compiled(rule)(self.test_msg1), True)
+        rule = self.psr.parse('(ConnCounts + 10) > 11')
+        self.assertEqual(self.flt.prepare_compiled(rule)(self.test_msg1), None)
+
+        # The compiled callable must be cached on the rule object itself.
+        rule = self.psr.parse('ConnCount == 2')
+        self.assertIs(self.flt.prepare_compiled(rule), self.flt.prepare_compiled(rule))
+
 
 #-------------------------------------------------------------------------------
 
@@ -315,7 +315,7 @@ class TestDataObjectFilterIDEA(unittest.TestCase):
         self.maxDiff = None
 
         rule = self.build_rule('DetectTime + 3600')
-        self.assertEqual(repr(rule), "MATHBINOP(VARIABLE('DetectTime') OP_PLUS TIMEDELTA(datetime.timedelta(0, 3600)))")
+        self.assertEqual(repr(rule), "MATHBINOP(VARIABLE('DetectTime') OP_PLUS TIMEDELTA(datetime.timedelta(seconds=3600)))")
         expected_res = (datetime.datetime(2016, 6, 21, 13, 8, 27) + datetime.timedelta(seconds = 3600))
         self.assertEqual(self.check_rule(rule), expected_res)
 
@@ -344,10 +344,10 @@ class TestDataObjectFilterIDEA(unittest.TestCase):
         self.assertEqual(repr(rule), "COMPBINOP(VARIABLE('DetectTime') OP_LE DATETIME(datetime.datetime(2016, 6, 21, 14, 8, 27)))")
         self.assertEqual(self.check_rule(rule), True)
         rule = self.build_rule('DetectTime < (utcnow() + 05:00:00)')
-        self.assertEqual(repr(rule), "COMPBINOP(VARIABLE('DetectTime') OP_LT MATHBINOP(FUNCTION(utcnow()) OP_PLUS TIMEDELTA(datetime.timedelta(0, 18000))))")
+        self.assertEqual(repr(rule), "COMPBINOP(VARIABLE('DetectTime') OP_LT MATHBINOP(FUNCTION(utcnow()) OP_PLUS TIMEDELTA(datetime.timedelta(seconds=18000))))")
         self.assertEqual(self.check_rule(rule), True)
         rule = self.build_rule('DetectTime > (utcnow() - 05:00:00)')
-        self.assertEqual(repr(rule), "COMPBINOP(VARIABLE('DetectTime') OP_GT MATHBINOP(FUNCTION(utcnow()) OP_MINUS TIMEDELTA(datetime.timedelta(0, 18000))))")
+        self.assertEqual(repr(rule), "COMPBINOP(VARIABLE('DetectTime') OP_GT MATHBINOP(FUNCTION(utcnow()) OP_MINUS TIMEDELTA(datetime.timedelta(seconds=18000))))")
         self.assertEqual(self.check_rule(rule), False)
 
         rule = self.build_rule('(Source.IP4 == 188.14.166.39)')
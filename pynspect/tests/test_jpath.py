@@ -24,7 +24,7 @@ import unittest
 from idea import lite
 from pynspect.jpath import JPathException, cache_size, cache_clear,\
     jpath_parse, jpath_parse_c, jpath_exists, jpath_set, jpath_unset, jpath_value, jpath_values,\
-    RC_VALUE_DUPLICATE, RC_VALUE_EXISTS, RC_VALUE_SET
+    jpath_values_parsed, RC_VALUE_DUPLICATE, RC_VALUE_EXISTS, RC_VALUE_SET
 
 
 # Monkeypatching for Py 2 & 3 compatibility, taken from typedcols package.
@@ -695,6 +695,17 @@ class TestJPath(unittest.TestCase):
             }
         )
 
+    def test_09_jpath_values_parsed(self):
+        """
+        Perform JPath values retrieval tests with already parsed JPath.
+        """
+        self.maxDiff = None
+
+        self.assertEqual(jpath_values_parsed(self.msg_dict, jpath_parse('Format')),         ['IDEA0'])
+        self.assertEqual(jpath_values_parsed(self.msg_dict, jpath_parse('Node.SW')),        ['KIPPO','FAIL_TO_BAN'])
+        self.assertEqual(jpath_values_parsed(self.msg_dict, jpath_parse('Source[#].IP4')),  ['192.168.2.1','192.168.2.2'])
+        self.assertEqual(jpath_values_parsed(self.msg_dict, jpath_parse('Source.IP4[*]')),  ['192.168.1.1','192.168.1.2','192.168.2.1','192.168.2.2'])
+
 
 #-------------------------------------------------------------------------------
 
@@ -41,6 +41,8 @@ __credits__ = "Pavel Kácha <pavel.kacha@cesnet.cz>, Andrea Kropáčová <andrea
 
 
 import re
+import array
+import bisect
 import collections
 import datetime
 
@@ -53,97 +55,97 @@ class BaseRuleTreeTraverser(object):
     mandatory interface that is required for an object to be able to traverse
     through given :py:class:`pynspect.rules.Rule` tree.
     """
-    def ipv4(self, rule, **kwargs):
+    def ipv4(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.IPV4Rule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         raise NotImplementedError()
 
-    def ipv6(self, rule, **kwargs):
+    def ipv6(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.IPV6Rule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         raise NotImplementedError()
 
-    def datetime(self, rule, **kwargs):
+    def datetime(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.DatetimeRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         raise NotImplementedError()
 
-    def timedelta(self, rule, **kwargs):
+    def timedelta(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.TimedeltaRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         raise NotImplementedError()
 
-    def integer(self, rule, **kwargs):
+    def integer(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.IntegerRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         raise NotImplementedError()
 
-    def float(self, rule, **kwargs):
+    def float(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.FloatRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         raise NotImplementedError()
 
-    def constant(self, rule, **kwargs):
+    def constant(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.ConstantRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         raise NotImplementedError()
 
-    def variable(self, rule, **kwargs):
+    def variable(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.VariableRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         raise NotImplementedError()
 
-    def list(self, rule, **kwargs):
+    def list(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.ListRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         raise NotImplementedError()
 
-    def binary_operation_logical(self, rule, left, right, **kwargs):
+    def binary_operation_logical(self, rule, left, right, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.LogicalBinOpRule.traverse` method.
@@ -151,11 +153,11 @@ class BaseRuleTreeTraverser(object):
         :param pynspect.rules.Rule rule: Reference to rule.
         :param left: Left operand for operation.
         :param right: right operand for operation.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         raise NotImplementedError()
 
-    def binary_operation_comparison(self, rule, left, right, **kwargs):
+    def binary_operation_comparison(self, rule, left, right, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.ComparisonBinOpRule.traverse` method.
@@ -163,11 +165,11 @@ class BaseRuleTreeTraverser(object):
         :param pynspect.rules.Rule rule: Reference to rule.
         :param left: Left operand for operation.
         :param right: right operand for operation.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         raise NotImplementedError()
 
-    def binary_operation_math(self, rule, left, right, **kwargs):
+    def binary_operation_math(self, rule, left, right, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.MathBinOpRule.traverse` method.
@@ -175,29 +177,29 @@ class BaseRuleTreeTraverser(object):
         :param pynspect.rules.Rule rule: Reference to rule.
         :param left: Left operand for operation.
         :param right: right operand for operation.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         raise NotImplementedError()
 
-    def unary_operation(self, rule, right, **kwargs):
+    def unary_operation(self, rule, right, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.UnaryOperationRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
         :param right: right operand for operation.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         raise NotImplementedError()
 
-    def function(self, rule, args, **kwargs):
+    def function(self, rule, args, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.FunctionRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
         :param args: Optional function arguments.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         raise NotImplementedError()
 
@@ -209,97 +211,97 @@ class PrintingTreeTraverser(BaseRuleTreeTraverser):
     """
     Demonstation of simple rule tree traverser - printing traverser.
     """
-    def ipv4(self, rule, **kwargs):
+    def ipv4(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.IPV4Rule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return "IPV4({})".format(rule.value)
 
-    def ipv6(self, rule, **kwargs):
+    def ipv6(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.IPV6Rule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return "IPV6({})".format(rule.value)
 
-    def datetime(self, rule, **kwargs):
+    def datetime(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.DatetimeRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return "DATETIME({})".format(rule.value)
 
-    def timedelta(self, rule, **kwargs):
+    def timedelta(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.TimedeltaRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return "TIMEDELTA({})".format(rule.value)
 
-    def integer(self, rule, **kwargs):
+    def integer(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.IntegerRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return "INTEGER({})".format(rule.value)
 
-    def float(self, rule, **kwargs):
+    def float(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.FloatRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return "FLOAT({})".format(rule.value)
 
-    def constant(self, rule, **kwargs):
+    def constant(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.ConstantRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return "CONSTANT({})".format(rule.value)
 
-    def variable(self, rule, **kwargs):
+    def variable(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.VariableRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return "VARIABLE({})".format(rule.value)
 
-    def list(self, rule, **kwargs):
+    def list(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.ListRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
-        return "LIST({})".format(', '.join([v.traverse(self, **kwargs) for v in rule.value]))
+        return "LIST({})".format(', '.join([v.traverse(self, obj) for v in rule.value]))
 
-    def binary_operation_logical(self, rule, left, right, **kwargs):
+    def binary_operation_logical(self, rule, left, right, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.LogicalBinOpRule.traverse` method.
@@ -307,11 +309,11 @@ class PrintingTreeTraverser(BaseRuleTreeTraverser):
         :param pynspect.rules.Rule rule: Reference to rule.
         :param left: Left operand for operation.
         :param right: right operand for operation.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return "LOGBINOP({};{};{})".format(rule.operation, left, right)
 
-    def binary_operation_comparison(self, rule, left, right, **kwargs):
+    def binary_operation_comparison(self, rule, left, right, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.ComparisonBinOpRule.traverse` method.
@@ -319,11 +321,11 @@ class PrintingTreeTraverser(BaseRuleTreeTraverser):
         :param pynspect.rules.Rule rule: Reference to rule.
         :param left: Left operand for operation.
         :param right: right operand for operation.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return "COMPBINOP({};{};{})".format(rule.operation, left, right)
 
-    def binary_operation_math(self, rule, left, right, **kwargs):
+    def binary_operation_math(self, rule, left, right, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.MathBinOpRule.traverse` method.
@@ -331,29 +333,29 @@ class PrintingTreeTraverser(BaseRuleTreeTraverser):
         :param pynspect.rules.Rule rule: Reference to rule.
         :param left: Left operand for operation.
         :param right: right operand for operation.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return "MATHBINOP({};{};{})".format(rule.operation, left, right)
 
-    def unary_operation(self, rule, right, **kwargs):
+    def unary_operation(self, rule, right, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.UnaryOperationRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
         :param right: right operand for operation.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return "UNOP({};{})".format(rule.operation, right)
 
-    def function(self, rule, args, **kwargs):
+    def function(self, rule, args, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.FunctionRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
         :param args: Optional function arguments.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return "FUNCTION({};{})".format(rule.function, ','.join(args))
 
@@ -362,97 +364,97 @@ class HTMLTreeTraverser(BaseRuleTreeTraverser):
     """
     Demonstation of simple rule tree traverser - HTML printing traverser.
     """
-    def ipv4(self, rule, **kwargs):
+    def ipv4(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.IPV4Rule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return '<div class="pynspect-rule-constant pynspect-rule-constant-ipv4"><code>{}</code></div>'.format(rule.value)
 
-    def ipv6(self, rule, **kwargs):
+    def ipv6(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.IPV6Rule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return '<div class="pynspect-rule-constant pynspect-rule-constant-ipv6"><code>{}</code></div>'.format(rule.value)
 
-    def datetime(self, rule, **kwargs):
+    def datetime(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.DatetimeRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return '<div class="pynspect-rule-constant pynspect-rule-constant-datetime"><code>{}</code></div>'.format(rule.value)
 
-    def timedelta(self, rule, **kwargs):
+    def timedelta(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.TimedeltaRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return '<div class="pynspect-rule-constant pynspect-rule-constant-timedelta"><code>{}</code></div>'.format(rule.value)
 
-    def integer(self, rule, **kwargs):
+    def integer(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.IntegerRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return '<div class="pynspect-rule-constant pynspect-rule-constant-integer"><code>{}</code></div>'.format(rule.value)
 
-    def float(self, rule, **kwargs):
+    def float(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.FloatRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return '<div class="pynspect-rule-constant pynspect-rule-constant-float"><code>{}</code></div>'.format(rule.value)
 
-    def constant(self, rule, **kwargs):
+    def constant(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.ConstantRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return '<div class="pynspect-rule-constant pynspect-rule-constant-string"><code>&quot;{}&quot;</code></div>'.format(rule.value)
 
-    def variable(self, rule, **kwargs):
+    def variable(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.VariableRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return '<div class="pynspect-rule-variable"><kbd>{}</kbd></div>'.format(rule.value)
 
-    def list(self, rule, **kwargs):
+    def list(self, rule, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.ListRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
-        return '<ul class="pynspect-rule-list">{}</ul>'.format(''.join(['<li class="pynspect-rule-list-item">{}</li>'.format(v.traverse(self, **kwargs)) for v in rule.value]))
+        return '<ul class="pynspect-rule-list">{}</ul>'.format(''.join(['<li class="pynspect-rule-list-item">{}</li>'.format(v.traverse(self, obj)) for v in rule.value]))
 
-    def binary_operation_logical(self, rule, left, right, **kwargs):
+    def binary_operation_logical(self, rule, left, right, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.LogicalBinOpRule.traverse` method.
@@ -460,11 +462,11 @@ class HTMLTreeTraverser(BaseRuleTreeTraverser):
         :param pynspect.rules.Rule rule: Reference to rule.
         :param left: Left operand for operation.
         :param right: right operand for operation.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return '<div class="pynspect-rule-operation pynspect-rule-operation-logical"><h3 class="pynspect-rule-operation-name">{}</h3><ul class="pynspect-rule-operation-arguments"><li class="pynspect-rule-operation-argument-left">{}</li><li class="pynspect-rule-operation-argument-right">{}</li></ul></div>'.format(rule.operation, left, right)
 
-    def binary_operation_comparison(self, rule, left, right, **kwargs):
+    def binary_operation_comparison(self, rule, left, right, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.ComparisonBinOpRule.traverse` method.
@@ -472,11 +474,11 @@ class HTMLTreeTraverser(BaseRuleTreeTraverser):
         :param pynspect.rules.Rule rule: Reference to rule.
         :param left: Left operand for operation.
         :param right: right operand for operation.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return '<div class="pynspect-rule-operation pynspect-rule-operation-comparison"><h3 class="pynspect-rule-operation-name">{}</h3><ul class="pynspect-rule-operation-arguments"><li class="pynspect-rule-operation-argument-left">{}</li><li class="pynspect-rule-operation-argument-right">{}</li></ul></div>'.format(rule.operation, left, right)
 
-    def binary_operation_math(self, rule, left, right, **kwargs):
+    def binary_operation_math(self, rule, left, right, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.MathBinOpRule.traverse` method.
@@ -484,29 +486,29 @@ class HTMLTreeTraverser(BaseRuleTreeTraverser):
         :param pynspect.rules.Rule rule: Reference to rule.
         :param left: Left operand for operation.
         :param right: right operand for operation.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return '<div class="pynspect-rule-operation pynspect-rule-operation-math"><h3 class="pynspect-rule-operation-name">{}</h3><ul class="pynspect-rule-operation-arguments"><li class="pynspect-rule-operation-argument-left">{}</li><li class="pynspect-rule-operation-argument-right">{}</li></ul></div>'.format(rule.operation, left, right)
 
-    def unary_operation(self, rule, right, **kwargs):
+    def unary_operation(self, rule, right, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.UnaryOperationRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
         :param right: right operand for operation.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return '<div class="pynspect-rule-operation pynspect-rule-operation-unary"><h3 class="pynspect-rule-operation-name">{}</h3><ul class="pynspect-rule-operation-arguments"><li class="pynspect-rule-operation-argument-right">{}</li></ul></div>'.format(rule.operation, right)
 
-    def function(self, rule, args, **kwargs):
+    def function(self, rule, args, obj = None):
         """
         Callback method for rule tree traversing. Will be called at proper time
         from :py:class:`pynspect.rules.FunctionRule.traverse` method.
 
         :param pynspect.rules.Rule rule: Reference to rule.
         :param args: Optional function arguments.
-        :param dict kwargs: Optional callback arguments.
+        :param obj: Optional processed data structure.
         """
         return '<div class="pynspect-rule-function"><h3 class="pynspect-rule-function-name">{}</h3><ul class="pynspect-rule-function-arguments>{}</ul></div>'.format(rule.function, ''.join(['<li class="pynspect-rule-function-argument">{}</li>'.format(v) for v in args]))
 
@@ -523,7 +525,19 @@ def _to_numeric(val):
     return float(val)
 
 
-class ListIP(collections.MutableSequence):
+def _ip_list_contains(lows, maxhighs, low, high):
+    """
+    Containment test kernel for sorted IP range bounds: locate the last range
+    starting at or below given lower bound and check, whether any range up to
+    that point reaches given upper bound. The bounds are passed in as flat
+    sequences of plain integers, so the kernel is independent of the ipranges
+    objects and can be swapped for a compiled implementation.
+    """
+    idx = bisect.bisect_right(lows, low) - 1
+    return idx >= 0 and maxhighs[idx] >= high
+
+
+class ListIP(collections.abc.MutableSequence):
     """
     Special list implementation designed to provide special handling of 'IN' operator.
     When item is being compared using 'IN' operator with this list, the IN operation
@@ -585,6 +599,53 @@ class ListIP(collections.MutableSequence):
         return "%s(%s)" % (type(self).__name__, repr(self.data))
 
 
+class SortedIPList(ListIP):
+    """
+    Special IP list implementation, that keeps its IP ranges sorted by their
+    lower bound and answers membership tests with a binary search instead of a
+    linear scan over all ranges. For allow/deny lists with N ranges this turns
+    the per-message cost of the 'IN' operator from O(N) into O(log N).
+
+    The list is meant to hold compiled constants and must not be modified after
+    construction, otherwise the internal search index becomes stale.
+    """
+
+    def __init__(self, iterable = None):
+        super(SortedIPList, self).__init__(iterable)
+        self.data.sort(key = lambda rng: (rng.low(), rng.high()))
+        lows = [rng.low() for rng in self.data]
+        # Running maximum of the upper bounds. Ranges may overlap, so the range
+        # found by the binary search is not necessarily the only candidate:
+        # some earlier range may start lower and still reach further. Thanks to
+        # the running maximum single comparison covers all of them.
+        maxhighs = []
+        maxhigh = None
+        for rng in self.data:
+            high = rng.high()
+            if maxhigh is None or high > maxhigh:
+                maxhigh = high
+            maxhighs.append(maxhigh)
+        try:
+            # Pack the bounds into compact contiguous arrays of machine
+            # integers whenever they fit (always the case for IPv4), plain
+            # lists of Python integers remain as fallback for IPv6.
+            self._lows     = array.array('Q', lows)
+            self._maxhighs = array.array('Q', maxhighs)
+        except OverflowError:
+            self._lows     = lows
+            self._maxhighs = maxhighs
+
+    def __contains__(self, val):
+        try:
+            low  = val.low()
+            high = val.high()
+        except AttributeError:
+            # Fall back to the linear scan for values, that do not provide the
+            # ipranges interface, and let the ranges deal with them themselves.
+            return super(SortedIPList, self).__contains__(val)
+        return _ip_list_contains(self._lows, self._maxhighs, low, high)
+
+
 class BaseFilteringTreeTraverser(BaseRuleTreeTraverser):  # pylint: disable=locally-disabled,abstract-method
     """
     Base class for all filtering rule tree traversers.
@@ -639,7 +700,7 @@ class BaseFilteringTreeTraverser(BaseRuleTreeTraverser):  # pylint: disable=loca
     def __init__(self):
         self.functions = {}
 
-    def evaluate_binop_logical(self, operation, left, right, **kwargs):
+    def evaluate_binop_logical(self, operation, left, right):
         """
         Evaluate given logical binary operation with given operands.
         """
@@ -648,7 +709,7 @@ class BaseFilteringTreeTraverser(BaseRuleTreeTraverser):  # pylint: disable=loca
         result = self.binops_logical[operation](left, right)
         return result
 
-    def evaluate_binop_comparison(self, operation, left, right, **kwargs):
+    def evaluate_binop_comparison(self, operation, left, right):
         """
         Evaluate given comparison binary operation with given operands.
         """
@@ -658,7 +719,25 @@ class BaseFilteringTreeTraverser(BaseRuleTreeTraverser):  # pylint: disable=loca
             return None
         if not isinstance(left, (list, ListIP)):
             left = [left]
-        if not isinstance(right, (list, ListIP)):
+        if isinstance(right, (set, frozenset)):
+            # Compiled constant lists may come in as sets to provide constant
+            # time membership tests for the 'OP_IN' operation.
+            if operation == 'OP_IN':
+                if not left or not right:
+                    return None
+                for iteml in left:
+                    # Unhashable values coming from malformed messages cannot
+                    # be probed in the set, but they could not equal any of
+                    # the hashable constants anyway, so skip them just like
+                    # the linear equality scan would.
+                    try:
+                        if iteml in right:
+                            return True
+                    except TypeError:
+                        continue
+                return False
+            right = list(right)
+        elif not isinstance(right, (list, ListIP)):
             right = [right]
         if not left or not right:
             return None
@@ -707,7 +786,7 @@ class BaseFilteringTreeTraverser(BaseRuleTreeTraverser):  # pylint: disable=loca
             raise FilteringRuleException("Uneven length of math operation '{}' operands".format(operation))
         return result
 
-    def evaluate_binop_math(self, operation, left, right, **kwargs):
+    def evaluate_binop_math(self, operation, left, right):
         """
         Evaluate given mathematical binary operation with given operands.
         """
@@ -729,7 +808,7 @@ class BaseFilteringTreeTraverser(BaseRuleTreeTraverser):  # pylint: disable=loca
         except:
             return None
 
-    def evaluate_unop(self, operation, right, **kwargs):
+    def evaluate_unop(self, operation, right):
         """
         Evaluate given unary operation with given operand.
         """
@@ -759,7 +838,7 @@ class BaseFilteringTreeTraverser(BaseRuleTreeTraverser):  # pylint: disable=loca
         """
         self.functions[name] = decorator(self.functions[name])
 
-    def function(self, rule, args, **kwargs):
+    def function(self, rule, args, obj = None):
         """
         Implementation of :py:func:`pynspect.traversers.RuleTreeTraverser.function` interface.
         """